@@ -1,4 +1,5 @@
 import os
+import re
 import feedparser
 from openai import OpenAI
 from dotenv import load_dotenv
@@ -6,6 +7,8 @@ import requests
 
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+PDF_DIR = os.getenv("PDF_DIR", "/home/arihant/researchbot/arvix/pdf/")
+
 def refine_query(user_query, model="gpt-4"):
     prompt = f"""Refine the following academic search query for arXiv to be more specific and relevant:
 
@@ -75,7 +78,70 @@ def search_arxiv(query, max_results=5):
 #         return f"Summary failed: {e}"
 #
 
-def run_ai_arxiv_search(user_query, max_results=5):
+def arxiv_id(paper):
+    """Version-less arXiv id, e.g. 'http://arxiv.org/abs/2401.01234v2' -> '2401.01234'."""
+    return re.sub(r"v\d+$", "", paper['url'].split("/abs/")[-1])
+
+
+def pdf_filename(paper):
+    """Cache file name keyed on the full versioned id, e.g. 'hep-th/9901001v1' -> 'hep-th_9901001v1.pdf'."""
+    return paper['url'].split("/abs/")[-1].replace("/", "_") + ".pdf"
+
+
+def is_cached_pdf(path):
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as f:
+        return f.read(5) == b"%PDF-"
+
+
+def download_pdf(paper, save_pdf=True, in_memory=False, pdf_dir=PDF_DIR):
+    """
+    Fetch paper['pdf_url'] into paper['pdf_bytes'] (in_memory) and/or
+    paper['file_path'] (save_pdf). A valid copy already in pdf_dir is reused as
+    paper['file_path'] without downloading, even with in_memory=True.
+    """
+    if not paper['pdf_url']:
+        raise ValueError("no PDF link")
+
+    save_path = os.path.join(pdf_dir, pdf_filename(paper))
+    if is_cached_pdf(save_path):
+        print(f"📁 Cached: {save_path}")
+        paper['file_path'] = save_path
+        return paper
+
+    paper_pdf = requests.get(paper['pdf_url'])
+    print(paper_pdf)
+    paper_pdf.raise_for_status()
+    if not paper_pdf.content.startswith(b"%PDF-"):
+        content_type = paper_pdf.headers.get("Content-Type", "")
+        raise ValueError(f"Expected a PDF from {paper['pdf_url']}, got {content_type!r}")
+    if in_memory:
+        paper['pdf_bytes'] = paper_pdf.content
+    if save_pdf:
+        os.makedirs(pdf_dir, exist_ok=True)
+        # write then rename so an interrupted download never leaves a cached file
+        tmp_path = save_path + ".part"
+        with open(tmp_path, 'wb') as f:
+            f.write(paper_pdf.content)
+        os.replace(tmp_path, save_path)
+        paper['file_path'] = save_path
+    return paper
+
+
+def run_ai_arxiv_search(user_query, max_results=5, save_pdf=True, in_memory=False, pdf_dir=PDF_DIR):
+    """
+    Search arXiv and download the PDF of every hit.
+
+    With in_memory=True freshly downloaded bytes are kept on paper['pdf_bytes']
+    so pdf_to_script can parse them directly; save_pdf=False skips the disk
+    write. Papers already cached in pdf_dir only get paper['file_path'], so
+    callers fall back to it (parsed with use_mmap=True) when pdf_bytes is
+    missing. Raw bytes are not JSON-serialisable, so in-memory papers must not
+    be returned from the API as-is.
+
+    A paper whose PDF cannot be fetched is kept with paper['error'] set.
+    """
     print(f"📝 Original query: {user_query}")
     refined_query = refine_query(user_query)
     print(f"🔍 Refined query: {refined_query}")
@@ -85,7 +151,7 @@ def run_ai_arxiv_search(user_query, max_results=5):
 
     if not papers:
         print("❌ No papers found.")
-        return
+        return []
     output = []
     for idx, paper in enumerate(papers, 1):
         print("*****************************************")
@@ -95,14 +161,13 @@ def run_ai_arxiv_search(user_query, max_results=5):
         print(f"🔗 PDF: {paper['pdf_url']}")
         # print(f"DOI : {paper['doi']}")
         print("\n🧠 AI Summary:")
-        paper_pdf = requests.get(paper['pdf_url'])
-        print(paper_pdf)
-        save_path = "/home/arihant/researchbot/arvix/pdf/" + paper['pdf_url'].split("/")[-1] + ".pdf"
-        with open(save_path, 'wb') as f:
-            f.write(paper_pdf.content)
-        paper['file_path'] = save_path
+        try:
+            download_pdf(paper, save_pdf=save_pdf, in_memory=in_memory, pdf_dir=pdf_dir)
+        except Exception as e:
+            print(f"❌ Download failed: {e}")
+            paper['error'] = str(e)
         output.append(paper)
-    return paper
+    return output
 
 
 # Example usage
@@ -0,0 +1,109 @@
+import os
+import time
+from dotenv import load_dotenv
+from arvix.core import refine_query, search_arxiv, download_pdf, arxiv_id
+from pdf_to_script import pdf_to_script
+from heygen_podcast_bot.main import gen_runner
+
+load_dotenv()
+
+
+def run_daily_batch(prompts: list, max_results=3, render=True, save_pdf=False):
+    """
+    Run every creator prompt, then parse, script, voice and render each unique
+    arXiv paper exactly once and fan the results back out per creator.
+
+    render=True goes through gen_runner, which writes fixed file names in
+    OUTPUT_DIR, so a batch must not run concurrently with another batch or
+    /search/ request.
+    """
+    start = time.perf_counter()
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+
+    # --- 1. refine + search per creator, dedupe by arXiv id ---
+    unique = {}          # arxiv id -> paper dict
+    creators = []
+    total_hits = 0
+
+    for prompt in prompts:
+        print(f"📝 Creator prompt: {prompt}")
+        refined_query = refine_query(prompt)
+        print(f"🔍 Refined query: {refined_query}")
+
+        ids = []
+        for paper in search_arxiv(refined_query, max_results=max_results):
+            pid = arxiv_id(paper)
+            total_hits += 1
+            unique.setdefault(pid, paper)
+            if pid not in ids:
+                ids.append(pid)
+        creators.append({"prompt": prompt, "refined_query": refined_query, "paper_ids": ids})
+
+    # --- 2. download, parse, script and render each unique paper once ---
+    processed = failed = skipped = 0
+
+    for pid, paper in unique.items():
+        if not paper["pdf_url"]:
+            print(f"⏭️ Skipping {pid}: no PDF link")
+            paper["skipped"] = "no PDF link"
+            skipped += 1
+            continue
+
+        print(f"📄 Processing {pid}: {paper['title']}")
+        try:
+            download_pdf(paper, save_pdf=save_pdf, in_memory=True)
+            # bytes are dropped as soon as this paper is parsed
+            source = paper.pop("pdf_bytes", None) or paper["file_path"]
+            paper["script"] = pdf_to_script([source], openai_api_key, use_mmap=True)[0]
+            del source
+            if render:
+                video_path = gen_runner(paper["script"])
+                if video_path is None:
+                    # gen_runner logs and swallows its own errors, and skips video without TALKING_PHOTO_ID
+                    raise RuntimeError("not rendered: voice/video step failed or TALKING_PHOTO_ID is unset")
+                paper["video_path"] = video_path
+            processed += 1
+        except Exception as e:
+            print(f"❌ Failed {pid}: {e}")
+            paper.pop("pdf_bytes", None)
+            paper["error"] = str(e)
+            failed += 1
+
+    # --- 3. fan back out per creator ---
+    results = [
+        {
+            "prompt": c["prompt"],
+            "refined_query": c["refined_query"],
+            "papers": [unique[pid] for pid in c["paper_ids"]],
+        }
+        for c in creators
+    ]
+
+    report = {
+        "creators": len(prompts),
+        "papers_found": total_hits,
+        "unique_papers": len(unique),
+        "duplicates_skipped": total_hits - len(unique),
+        "papers_processed": processed,
+        "papers_failed": failed,
+        "papers_skipped": skipped,
+        "wall_clock_seconds": round(time.perf_counter() - start, 2),
+    }
+    print(f"✅ Batch done: {report}")
+
+    return {"results": results, "report": report}
+
+
+if __name__ == "__main__":
+    print("Enter one creator prompt per line (end with an empty line or Ctrl+D):")
+    prompts = []
+    try:
+        for line in iter(input, ""):
+            prompts.append(line)
+    except EOFError:
+        pass
+
+    if not prompts:
+        print("No prompts entered. Exiting.")
+    else:
+        run_daily_batch(prompts)
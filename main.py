@@ -3,6 +3,7 @@ from pydantic import BaseModel
 from arvix.core import run_ai_arxiv_search
 from typing import List
 from heygen_podcast_bot.main import gen_runner
+from batch import run_daily_batch
 app = FastAPI()
 
 class ArxivQuery(BaseModel):
@@ -19,3 +20,15 @@ def search_arxiv_api(query: ArxivQuery):
 
 
     return { "results": papers}
+
+
+class BatchQuery(BaseModel):
+    prompts: List[str]
+    max_results: int = 3
+    render: bool = False    # voicing + HeyGen polling per paper outlives HTTP timeouts; use the CLI
+
+@app.post("/batch/")
+def daily_batch_api(query: BatchQuery):
+    # render=True goes through gen_runner's fixed OUTPUT_DIR files: do not run
+    # concurrently with another /batch/ or /search/ request
+    return run_daily_batch(query.prompts, max_results=query.max_results, render=query.render)
@@ -1,8 +1,28 @@
+import io
 import json
+import mmap
+import os
+from contextlib import contextmanager
 
 DEBUG = False
 
 
+@contextmanager
+def open_pdf_source(src, use_mmap: bool = False):
+    """Yield the partition_pdf keyword (filename= or file=) for a path, raw bytes or file-like."""
+    if isinstance(src, (bytes, bytearray, memoryview)):
+        yield {"file": io.BytesIO(src)}    # parse straight from the downloaded bytes
+    elif hasattr(src, "read"):
+        yield {"file": src}
+    elif use_mmap and os.path.isfile(src) and os.path.getsize(src) > 0:
+        # cached PDF: parse it through the same file= path as downloaded bytes;
+        # zero-byte files (interrupted downloads) cannot be mapped
+        with open(src, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield {"file": mm}
+    else:
+        yield {"filename": src}
+
+
 def classify_chunk(txt: str, client, MODEL, SYSTEM) -> str | None:
     """Return heading text or None."""
     user = f"Text chunk:\n'''{txt}'''"
@@ -38,8 +58,12 @@ def find_n_section(chunks: list[str], n: int, client, MODEL, SYSTEM) -> int | No
 
     return None  # never saw n sections
 
-def pdf_to_script(pdf_paths: list, openai_api_key):
-    
+def pdf_to_script(pdf_paths: list, openai_api_key, use_mmap: bool = False):
+    """
+    Turn each PDF into a six-part script. Items in pdf_paths may be file paths,
+    raw PDF bytes (e.g. paper['pdf_bytes']) or open binary file objects.
+    """
+
     # --- 1. Import libraries ---
     import pandas as pd
     from unstructured.partition.pdf import partition_pdf
@@ -110,15 +134,16 @@ def pdf_to_script(pdf_paths: list, openai_api_key):
     for pdf_path in pdf_paths:
         
         # --- 1. run Unstructured with layout, images, and metadata ---
-        elements = partition_pdf(
-            filename=pdf_path,
-            strategy="fast",
-            extract_images=True,           # save images if embedded
-            infer_table_structure=True,    # keep <table> tags intact
-            include_metadata=True,         # page numbers, bboxes, etc.
-            chunking_strategy="by_title",  # groups narrative by headings
-            strategy_kwargs={"multipage_sections": True},
-        )
+        with open_pdf_source(pdf_path, use_mmap) as source:
+            elements = partition_pdf(
+                **source,
+                strategy="fast",
+                extract_images=True,           # save images if embedded
+                infer_table_structure=True,    # keep <table> tags intact
+                include_metadata=True,         # page numbers, bboxes, etc.
+                chunking_strategy="by_title",  # groups narrative by headings
+                strategy_kwargs={"multipage_sections": True},
+            )
 
         # --- 2. walk the element stream ---
         info = []
@@ -0,0 +1,89 @@
+import os
+import sys
+import types
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+try:
+    import heygen_podcast_bot.main
+except ImportError:
+    # heygen_podcast_bot/main.py only imports when run from its own folder;
+    # gen_runner is replaced in every test below anyway
+    sys.modules["heygen_podcast_bot.main"] = types.SimpleNamespace(gen_runner=None)
+
+import pytest
+
+import batch
+
+
+def hit(pid, pdf=True):
+    return {"title": pid, "url": f"http://arxiv.org/abs/{pid}v1",
+            "pdf_url": f"http://arxiv.org/pdf/{pid}v1" if pdf else None}
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    """Stub every external step; search hits are the words of the refined query."""
+    calls = {"download": [], "parse": [], "render": []}
+
+    def download_pdf(paper, **kwargs):
+        calls["download"].append(paper["title"])
+        if paper["title"].startswith("bad"):
+            raise ValueError("Expected a PDF")
+        paper["pdf_bytes"] = b"%PDF-" + paper["title"].encode()
+        return paper
+
+    def pdf_to_script(sources, key, use_mmap=False):
+        calls["parse"].append(sources[0])
+        return [f"script for {sources[0][5:].decode()}"]
+
+    def gen_runner(script):
+        calls["render"].append(script)
+        return None if "norender" in script else f"{script}.mp4"
+
+    monkeypatch.setattr(batch, "refine_query", lambda q: q)
+    monkeypatch.setattr(batch, "search_arxiv",
+                        lambda q, max_results: [hit(w.rstrip("-"), pdf=not w.endswith("-")) for w in q.split()])
+    monkeypatch.setattr(batch, "download_pdf", download_pdf)
+    monkeypatch.setattr(batch, "pdf_to_script", pdf_to_script)
+    monkeypatch.setattr(batch, "gen_runner", gen_runner)
+    return calls
+
+
+def test_shared_papers_are_processed_once_and_fanned_out(pipeline):
+    out = batch.run_daily_batch(["a b", "b c", "c a"])
+
+    assert sorted(pipeline["download"]) == ["a", "b", "c"]
+    assert len(pipeline["render"]) == 3
+    assert [[p["title"] for p in r["papers"]] for r in out["results"]] == [["a", "b"], ["b", "c"], ["c", "a"]]
+    assert out["results"][0]["papers"][1] is out["results"][1]["papers"][0]
+    assert out["results"][0]["papers"][0]["video_path"] == "script for a.mp4"
+    assert all("pdf_bytes" not in p for r in out["results"] for p in r["papers"])
+
+    report = out["report"]
+    assert (report["creators"], report["papers_found"], report["unique_papers"]) == (3, 6, 3)
+    assert report["duplicates_skipped"] == 3
+    assert (report["papers_processed"], report["papers_failed"], report["papers_skipped"]) == (3, 0, 0)
+
+
+def test_failures_and_skips_are_counted_per_paper(pipeline):
+    out = batch.run_daily_batch(["a bad nopdf-", "norender a"])
+    papers = {p["title"]: p for r in out["results"] for p in r["papers"]}
+
+    assert papers["bad"]["error"] == "Expected a PDF"
+    assert papers["nopdf"]["skipped"] == "no PDF link"
+    assert papers["norender"]["error"].startswith("not rendered")
+    assert "video_path" not in papers["norender"]
+    assert papers["a"]["video_path"] == "script for a.mp4"
+
+    report = out["report"]
+    assert report["unique_papers"] == 4
+    assert (report["papers_processed"], report["papers_failed"], report["papers_skipped"]) == (1, 2, 1)
+
+
+def test_render_false_only_scripts(pipeline):
+    out = batch.run_daily_batch(["a"], render=False)
+
+    assert pipeline["render"] == []
+    assert out["results"][0]["papers"][0]["script"] == "script for a"
+    assert out["report"]["papers_processed"] == 1
@@ -0,0 +1,113 @@
+import io
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import pytest
+
+from arvix import core
+from pdf_to_script import open_pdf_source
+
+PDF = b"%PDF-1.4 fake"
+
+
+def make_paper(url="http://arxiv.org/abs/2401.01234v2", pdf_url="http://arxiv.org/pdf/2401.01234v2"):
+    return {"title": "t", "authors": ["a"], "published": "p", "url": url, "pdf_url": pdf_url}
+
+
+class FakeResponse:
+    def __init__(self, content, status=200, content_type="application/pdf"):
+        self.content = content
+        self.status = status
+        self.headers = {"Content-Type": content_type}
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError(f"HTTP {self.status}")
+
+
+def test_arxiv_id_strips_version():
+    assert core.arxiv_id(make_paper()) == "2401.01234"
+    assert core.arxiv_id(make_paper("http://arxiv.org/abs/hep-th/9901001v1")) == "hep-th/9901001"
+
+
+def test_pdf_filename_keeps_archive_and_version():
+    hep = make_paper("http://arxiv.org/abs/hep-th/9901001v1")
+    math = make_paper("http://arxiv.org/abs/math/9901001v1")
+    assert core.pdf_filename(hep) == "hep-th_9901001v1.pdf"
+    assert core.pdf_filename(hep) != core.pdf_filename(math)
+
+
+def test_open_pdf_source_dispatch(tmp_path):
+    cached = tmp_path / "cached.pdf"
+    cached.write_bytes(PDF)
+    empty = tmp_path / "empty.pdf"
+    empty.write_bytes(b"")
+    buf = io.BytesIO(PDF)
+
+    with open_pdf_source(PDF) as kw:
+        assert kw["file"].read() == PDF
+    with open_pdf_source(buf) as kw:
+        assert kw["file"] is buf
+    with open_pdf_source(str(cached), use_mmap=True) as kw:
+        assert kw["file"].read() == PDF
+    with open_pdf_source(str(cached)) as kw:
+        assert kw == {"filename": str(cached)}
+    with open_pdf_source(str(empty), use_mmap=True) as kw:
+        assert kw == {"filename": str(empty)}
+
+
+def test_download_pdf_reuses_valid_cache(tmp_path, monkeypatch):
+    paper = make_paper()
+    (tmp_path / core.pdf_filename(paper)).write_bytes(PDF)
+    monkeypatch.setattr(core.requests, "get", lambda url: pytest.fail("cached PDF was re-downloaded"))
+
+    core.download_pdf(paper, in_memory=True, pdf_dir=str(tmp_path))
+
+    assert paper["file_path"] == str(tmp_path / core.pdf_filename(paper))
+    assert "pdf_bytes" not in paper
+
+
+def test_download_pdf_replaces_invalid_cache(tmp_path, monkeypatch):
+    paper = make_paper()
+    cached = tmp_path / core.pdf_filename(paper)
+    cached.write_bytes(b"<html>rate limited</html>")
+    monkeypatch.setattr(core.requests, "get", lambda url: FakeResponse(PDF))
+
+    core.download_pdf(paper, in_memory=True, pdf_dir=str(tmp_path))
+
+    assert paper["pdf_bytes"] == PDF
+    assert cached.read_bytes() == PDF
+    assert os.listdir(tmp_path) == [cached.name]
+
+
+@pytest.mark.parametrize("response", [
+    FakeResponse(b"<html>slow down</html>", status=503, content_type="text/html"),
+    FakeResponse(b"<html>captcha</html>", content_type="text/html"),
+])
+def test_download_pdf_rejects_bad_response(tmp_path, monkeypatch, response):
+    monkeypatch.setattr(core.requests, "get", lambda url: response)
+
+    with pytest.raises(Exception):
+        core.download_pdf(make_paper(), pdf_dir=str(tmp_path))
+    assert os.listdir(tmp_path) == []
+
+
+def test_run_ai_arxiv_search_keeps_going_on_bad_pdf(tmp_path, monkeypatch):
+    good = make_paper()
+    missing = make_paper("http://arxiv.org/abs/2401.09999v1", pdf_url=None)
+    monkeypatch.setattr(core, "refine_query", lambda q: q)
+    monkeypatch.setattr(core, "search_arxiv", lambda q, max_results: [missing, good])
+    monkeypatch.setattr(core.requests, "get", lambda url: FakeResponse(PDF))
+
+    papers = core.run_ai_arxiv_search("q", pdf_dir=str(tmp_path))
+
+    assert papers == [missing, good]
+    assert missing["error"] == "no PDF link"
+    assert "error" not in good and os.path.isfile(good["file_path"])
+
+
+def test_run_ai_arxiv_search_no_hits(monkeypatch):
+    monkeypatch.setattr(core, "refine_query", lambda q: q)
+    monkeypatch.setattr(core, "search_arxiv", lambda q, max_results: [])
+    assert core.run_ai_arxiv_search("q") == []